@@ -6,78 +6,289 @@ A simplified version using Python and JSON for auth credentials
 
 import os
 import json
+import hashlib
 import subprocess
 import argparse
 import sys
 import shutil
+import struct
+import time
+from functools import cached_property
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_loads(buf):
+    """Parse JSON from str or bytes, using orjson when it is installed
+    
+    Anything orjson rejects is re-parsed with the stdlib json module, so
+    BOMs and other encodings behave exactly as they do with json.loads and
+    genuine syntax errors still surface as json.JSONDecodeError.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(buf)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(buf)
+
+
+def _json_dumps(data, int_keys=False):
+    """Serialize data to indented UTF-8 JSON bytes, using orjson when it is installed
+    
+    Set int_keys when dicts in data may have int keys; they are written as
+    JSON strings (the stdlib json module always does this).
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2
+        if int_keys:
+            option |= orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(data, option=option)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+# How long (seconds) a "is Claude Code running" result is reused across invocations
+RUNNING_CHECK_TTL = 5.0
+
+# Layout of the running-check cache file: running flag, then time.time() of the check
+RUNNING_CACHE_FORMAT = '<?d'
+
+# Required sequence file fields and the type each must have (None: any type)
+SEQUENCE_FIELD_TYPES = {
+    'activeAccountNumber': (int, "activeAccountNumber must be an integer"),
+    'lastUpdated': (None, None),
+    'sequence': (list, "sequence must be a list"),
+    'accounts': (dict, "accounts must be a dictionary"),
+}
+
+
+def _copy_sequence(data):
+    """Copy sequence data, specialized for the sequence file schema
+    
+    Much cheaper than copy.deepcopy: the containers are copied directly and,
+    since account entries only hold scalar values, a flat copy of each entry
+    is enough for callers to mutate the result freely.
+    """
+    copied = dict(data)
+    copied['sequence'] = list(data['sequence'])
+    copied['accounts'] = {acc_num: dict(acc_info) for acc_num, acc_info in data['accounts'].items()}
+    return copied
+
+
+def _unlink_if_exists(path):
+    """Remove a file, doing nothing if it is already gone"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _config_hash(buf):
+    """Short fingerprint of a config file's raw bytes, used to detect changes"""
+    return hashlib.blake2b(buf, digest_size=8).hexdigest()
+
+
+def _claude_running_toolhelp():
+    """Look for a Claude*.exe process using a Toolhelp32 snapshot
+    
+    Enumerates processes in-process through kernel32 instead of starting
+    tasklist.exe. Raises if the API is unavailable (e.g. not on Windows).
+    """
+    import ctypes
+    from ctypes import wintypes
+    
+    TH32CS_SNAPPROCESS = 0x00000002
+    INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+    
+    class PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [
+            ('dwSize', wintypes.DWORD),
+            ('cntUsage', wintypes.DWORD),
+            ('th32ProcessID', wintypes.DWORD),
+            ('th32DefaultHeapID', ctypes.c_void_p),
+            ('th32ModuleID', wintypes.DWORD),
+            ('cntThreads', wintypes.DWORD),
+            ('th32ParentProcessID', wintypes.DWORD),
+            ('pcPriClassBase', wintypes.LONG),
+            ('dwFlags', wintypes.DWORD),
+            ('szExeFile', wintypes.WCHAR * wintypes.MAX_PATH),
+        ]
+    
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+    kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    kernel32.Process32FirstW.restype = wintypes.BOOL
+    kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    kernel32.Process32NextW.restype = wintypes.BOOL
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    kernel32.CloseHandle.restype = wintypes.BOOL
+    
+    snapshot = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if snapshot is None or snapshot == INVALID_HANDLE_VALUE:
+        raise ctypes.WinError(ctypes.get_last_error())
+    
+    try:
+        entry = PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+        if not kernel32.Process32FirstW(snapshot, ctypes.byref(entry)):
+            raise ctypes.WinError(ctypes.get_last_error())
+        
+        while True:
+            # Same match as tasklist's "IMAGENAME eq Claude*.exe" filter
+            exe_name = entry.szExeFile.lower()
+            if exe_name.startswith('claude') and exe_name.endswith('.exe'):
+                return True
+            if not kernel32.Process32NextW(snapshot, ctypes.byref(entry)):
+                return False
+    finally:
+        kernel32.CloseHandle(snapshot)
+
 
 class ClaudeAccountSwitcher:
     """
     A class to manage Claude Code accounts on Windows systems
     """
     
-    def __init__(self):
-        # Define directories and files
-        self.home_dir = Path.home()
-        self.backup_dir = self.home_dir / '.claude-switch-backup'
-        self.sequence_file = self.backup_dir / 'sequence.json'
-        self.configs_dir = self.backup_dir / 'configs'
-        self.credentials_dir = self.backup_dir / 'credentials'
-        
-        # Claude Code config files
-        self.claude_config_file = self.home_dir / '.claude.json'
-        self.claude_alt_config_file = self.home_dir / '.claude' / '.claude.json'
-        
-        # Initialize directories
-        self.backup_dir.mkdir(exist_ok=True)
-        self.configs_dir.mkdir(exist_ok=True)
-        self.credentials_dir.mkdir(exist_ok=True)
-        
-        # Initialize sequence file if it doesn't exist
-        if not self.sequence_file.exists():
-            with open(self.sequence_file, 'w') as f:
-                json.dump({
+    def __init__(self, assume_yes=False):
+        # Answer 'y' to every confirmation prompt (--yes), for scripted use
+        self.assume_yes = assume_yes
+        
+        # Parsed sequence data, keyed by the (mtime_ns, size) of the file it was read from
+        self._sequence_cache = None
+        self._sequence_stat = None
+        # Lookup indexes over the cached data: lowercased email -> account number,
+        # and the set of account numbers in the sequence
+        self._email_index = {}
+        self._seq_set = set()
+        
+        # Directories and the sequence file are created on first write, not
+        # here, so read-only commands like --list touch nothing on disk
+        self._initialized = False
+    
+    def _ensure_initialized(self):
+        """Create the backup directories and sequence file if they don't exist yet"""
+        if self._initialized:
+            return
+        
+        # Initialize directories and the sequence file if it doesn't exist. The
+        # sequence file is created last, so if it exists the directories do too.
+        if not os.path.exists(self._sequence_file_str):
+            # makedirs creates backup_dir as the parent of the leaf directories
+            os.makedirs(self.configs_dir, exist_ok=True)
+            os.makedirs(self.credentials_dir, exist_ok=True)
+            with open(self._sequence_file_str, 'wb') as f:
+                f.write(_json_dumps({
                     "activeAccountNumber": 0,
                     "lastUpdated": datetime.now().isoformat(),
                     "sequence": [],
-                    "accounts": {}
-                }, f, indent=2)
+                    "accounts": {},
+                    "nextAccountNumber": 1
+                }))
+        self._initialized = True
+    
+    # Directories and files, each built once per instance on first use
+    @cached_property
+    def home_dir(self):
+        return Path.home()
+    
+    @cached_property
+    def backup_dir(self):
+        return self.home_dir / '.claude-switch-backup'
+    
+    @cached_property
+    def sequence_file(self):
+        return self.backup_dir / 'sequence.json'
+    
+    @cached_property
+    def _sequence_file_str(self):
+        # Plain str form for os/open calls, which skip __fspath__ for str
+        return str(self.sequence_file)
+    
+    @cached_property
+    def configs_dir(self):
+        return self.backup_dir / 'configs'
+    
+    @cached_property
+    def credentials_dir(self):
+        return self.backup_dir / 'credentials'
+    
+    # Claude Code config files
+    @cached_property
+    def claude_config_file(self):
+        return self.home_dir / '.claude.json'
+    
+    @cached_property
+    def claude_alt_config_file(self):
+        return self.home_dir / '.claude' / '.claude.json'
+    
+    @cached_property
+    def running_cache_file(self):
+        return self.backup_dir / '.running_cache'
     
     def load_sequence(self):
-        """Load the sequence file data with validation"""
+        """Load the sequence file data with validation
+        
+        The parsed data is cached until the file changes on disk; callers get
+        their own copy, so mutating the result does not touch the cache.
+        """
+        try:
+            st = os.stat(self._sequence_file_str)
+        except FileNotFoundError:
+            print(f"ERROR: Sequence file {self.sequence_file} not found")
+            raise
+        
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if self._sequence_cache is not None and stat_key == self._sequence_stat:
+            return _copy_sequence(self._sequence_cache)
+        
         encodings_to_try = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252']
         
+        # Read the whole file with a single read on the raw descriptor, sized
+        # from fstat, rather than through a buffered file object. The file is
+        # only ever replaced, never rewritten in place, so the size is stable.
+        try:
+            fd = os.open(self._sequence_file_str, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        except FileNotFoundError:
+            print(f"ERROR: Sequence file {self.sequence_file} not found")
+            raise
+        try:
+            st = os.fstat(fd)
+            buf = os.read(fd, st.st_size)
+        finally:
+            os.close(fd)
+        stat_key = (st.st_mtime_ns, st.st_size)
+        
+        # Try each encoding on the in-memory buffer; UTF-8 is parsed from the
+        # bytes directly without an intermediate str
         for encoding in encodings_to_try:
             try:
-                with open(self.sequence_file, 'r', encoding=encoding) as f:
-                    data = json.load(f)
-                    
-                # Validate required fields
-                required_fields = ['activeAccountNumber', 'lastUpdated', 'sequence', 'accounts']
-                for field in required_fields:
-                    if field not in data:
-                        raise ValueError(f"Missing required field '{field}' in sequence file")
+                data = _json_loads(buf if encoding == 'utf-8' else buf.decode(encoding))
+                self.validate_sequence_data(data, 'sequence file')
+                
+                # Account numbers are int keys in memory; JSON can only store them as strings
+                data['accounts'] = {int(acc_num): acc_info for acc_num, acc_info in data['accounts'].items()}
                 
-                # Validate data types
-                if not isinstance(data['activeAccountNumber'], int):
-                    raise ValueError("activeAccountNumber must be an integer")
-                if not isinstance(data['sequence'], list):
-                    raise ValueError("sequence must be a list")
-                if not isinstance(data['accounts'], dict):
-                    raise ValueError("accounts must be a dictionary")
+                # Files written before nextAccountNumber existed get it derived here.
+                # Older versions of this script (or a hand edit) may also have added
+                # accounts without advancing it, so never hand out a number in use.
+                data['nextAccountNumber'] = max(data.get('nextAccountNumber', 1),
+                                                max(data['sequence'], default=0) + 1)
                 
-                return data
+                self._sequence_cache = data
+                self._sequence_stat = stat_key
+                self._index_sequence(data)
+                return _copy_sequence(data)
             except UnicodeDecodeError:
                 continue  # Try next encoding
             except json.JSONDecodeError:
                 print(f"ERROR: Invalid JSON in {self.sequence_file}")
                 raise
-            except FileNotFoundError:
-                print(f"ERROR: Sequence file {self.sequence_file} not found")
-                raise
             except ValueError as e:
                 print(f"ERROR: {e}")
                 raise
@@ -87,28 +298,18 @@ class ClaudeAccountSwitcher:
     
     def save_sequence(self, data):
         """Save data to the sequence file with validation"""
+        self._ensure_initialized()
         try:
             # Validate data before saving
-            required_fields = ['activeAccountNumber', 'lastUpdated', 'sequence', 'accounts']
-            for field in required_fields:
-                if field not in data:
-                    raise ValueError(f"Missing required field '{field}' in data")
-            
-            # Validate data types
-            if not isinstance(data['activeAccountNumber'], int):
-                raise ValueError("activeAccountNumber must be an integer")
-            if not isinstance(data['sequence'], list):
-                raise ValueError("sequence must be a list")
-            if not isinstance(data['accounts'], dict):
-                raise ValueError("accounts must be a dictionary")
+            self.validate_sequence_data(data, 'data')
             
-            # Write to a temporary file first, then move to prevent corruption
-            temp_file = self.sequence_file.with_suffix('.tmp')
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            self._write_file_atomic(self._sequence_file_str, _json_dumps(data, int_keys=True))
             
-            # Replace the original file with the new one
-            temp_file.replace(self.sequence_file)
+            # Keep the cache in step with what was just written
+            st = os.stat(self._sequence_file_str)
+            self._sequence_cache = _copy_sequence(data)
+            self._sequence_stat = (st.st_mtime_ns, st.st_size)
+            self._index_sequence(data)
             
         except IOError as e:
             print(f"ERROR: Could not write to sequence file: {e}")
@@ -117,6 +318,58 @@ class ClaudeAccountSwitcher:
             print(f"ERROR: Invalid data format: {e}")
             raise
     
+    def _index_sequence(self, data):
+        """Rebuild the account lookup indexes from freshly loaded or saved sequence data"""
+        email_index = {}
+        for acc_num, acc_info in data['accounts'].items():
+            # First match wins, as with the old linear scan
+            email_index.setdefault(acc_info.get('email', '').lower(), acc_num)
+        self._email_index = email_index
+        self._seq_set = set(data['sequence'])
+    
+    def find_account_number(self, target_account):
+        """Resolve an account number or email to an account number, or None if unknown
+        
+        Uses the indexes built by the last load_sequence or save_sequence call.
+        """
+        if str(target_account).isdigit():
+            if int(target_account) in self._seq_set:
+                return int(target_account)
+            return None
+        return self._email_index.get(str(target_account).lower())
+    
+    def confirm(self, prompt):
+        """Ask a y/N question, or answer yes without prompting when assume_yes is set"""
+        if self.assume_yes:
+            print(f"{prompt}y")
+            return True
+        response = input(prompt)
+        return response.lower() == 'y'
+    
+    def validate_sequence_data(self, data, source):
+        """Validate sequence data in one pass over its fields, raising ValueError if invalid"""
+        if not isinstance(data, dict):
+            raise ValueError(f"Top-level value in {source} must be a JSON object")
+        
+        for field, (expected_type, message) in SEQUENCE_FIELD_TYPES.items():
+            if field not in data:
+                raise ValueError(f"Missing required field '{field}' in {source}")
+            if expected_type is not None and not isinstance(data[field], expected_type):
+                raise ValueError(message)
+        
+        # Account numbers are compared and maxed, so mixed types can't be allowed
+        if not all(isinstance(acc_num, int) for acc_num in data['sequence']):
+            raise ValueError("sequence must only contain account numbers (integers)")
+        
+        # Keys are account numbers: ints in memory, digit strings as stored in JSON
+        for acc_num in data['accounts']:
+            if not (isinstance(acc_num, int) or (isinstance(acc_num, str) and acc_num.isascii() and acc_num.isdigit())):
+                raise ValueError(f"accounts keys must be account numbers, found {acc_num!r}")
+        
+        # Optional, as files written before it existed don't have it
+        if 'nextAccountNumber' in data and not isinstance(data['nextAccountNumber'], int):
+            raise ValueError("nextAccountNumber must be an integer")
+    
     def validate_claude_config(self, config_data):
         """Validate Claude Code configuration data"""
         if not isinstance(config_data, dict):
@@ -141,24 +394,39 @@ class ClaudeAccountSwitcher:
     
     def load_config_file(self, file_path):
         """Load a config file with validation and proper encoding handling"""
-        encodings_to_try = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252']
+        return self._load_config_file_raw(file_path)[0]
+    
+    def _load_config_file_raw(self, file_path):
+        """Load a config file, returning (data, raw bytes) or (None, None) on failure"""
+        # Claude Code writes UTF-8; other encodings are only tried if that fails
+        fallback_encodings = ['cp1252', 'latin-1']
         
-        for encoding in encodings_to_try:
+        try:
+            buf = file_path.read_bytes()
+        except FileNotFoundError:
+            print(f"ERROR: Config file {file_path} not found")
+            return None, None
+        
+        # json.loads decodes UTF-8 (with or without a BOM) straight from bytes
+        try:
+            return _json_loads(buf), buf
+        except UnicodeDecodeError:
+            pass
+        except json.JSONDecodeError:
+            print(f"ERROR: Invalid JSON in {file_path}")
+            return None, None
+        
+        for encoding in fallback_encodings:
             try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    data = json.load(f)
-                return data
+                return _json_loads(buf.decode(encoding)), buf
             except UnicodeDecodeError:
                 continue  # Try next encoding
             except json.JSONDecodeError:
                 print(f"ERROR: Invalid JSON in {file_path}")
-                return None
-            except FileNotFoundError:
-                print(f"ERROR: Config file {file_path} not found")
-                return None
+                return None, None
         
-        print(f"ERROR: Could not read {file_path} with any of the attempted encodings: {encodings_to_try}")
-        return None
+        print(f"ERROR: Could not read {file_path} as UTF-8 or any of the fallback encodings: {fallback_encodings}")
+        return None, None
     
     def save_config_file(self, file_path, data):
         """Save a config file with validation"""
@@ -169,64 +437,139 @@ class ClaudeAccountSwitcher:
                 print(f"ERROR: Invalid config data - {message}")
                 return False
             
-            # Write to a temporary file first, then move to prevent corruption
-            temp_file = file_path.with_suffix('.tmp')
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-            
-            # Replace the original file with the new one
-            temp_file.replace(file_path)
+            self._write_json_atomic(file_path, data)
             return True
         except IOError as e:
             print(f"ERROR: Could not write to config file {file_path}: {e}")
             return False
     
+    def _write_json_atomic(self, file_path, data):
+        """Serialize and atomically write data without validating it; callers must have done so"""
+        self._write_file_atomic(file_path, _json_dumps(data))
+    
+    def _write_file_atomic(self, file_path, buf):
+        """Write bytes to file_path via a temporary file so it is never left half-written
+        
+        Works on plain str paths and raw descriptors: no Path objects or
+        buffered file objects, and a single write() for typical small files.
+        """
+        path_str = os.fspath(file_path)
+        temp_str = path_str + '.tmp'
+        
+        # A temp file left behind by a crash may be a hardlink made by
+        # _link_or_write; opening it for writing would truncate the linked backup
+        _unlink_if_exists(temp_str)
+        
+        # Write to a temporary file first, then move to prevent corruption
+        fd = os.open(temp_str, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o600)
+        try:
+            view = memoryview(buf)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        
+        # Replace the original file with the new one
+        os.replace(temp_str, path_str)
+    
+    def _link_or_write(self, source_file, file_path, buf):
+        """Make file_path a hardlink to source_file, or write buf to it if linking isn't supported
+        
+        buf must be the exact contents of source_file.
+        """
+        path_str = os.fspath(file_path)
+        temp_str = path_str + '.tmp'
+        # os.link refuses to overwrite, so clear any temp file left by an earlier crash
+        _unlink_if_exists(temp_str)
+        try:
+            os.link(source_file, temp_str)
+        except OSError:
+            # Filesystem without hardlinks (e.g. FAT32), write a second copy
+            self._write_file_atomic(path_str, buf)
+            return
+        try:
+            os.replace(temp_str, path_str)
+        except OSError:
+            os.unlink(temp_str)
+            raise
+    
     def get_next_account_number(self):
         """Get the next available account number"""
-        data = self.load_sequence()
-        if not data['sequence']:
-            return 1
-        return max(data['sequence']) + 1
+        self._ensure_initialized()
+        return self.load_sequence()['nextAccountNumber']
     
     def get_claude_config(self):
         """Get Claude Code config from the appropriate file with validation"""
+        return self._get_claude_config_raw()[0]
+    
+    def _get_claude_config_raw(self):
+        """Get Claude Code config as (data, raw bytes); ({}, b'') if none is found"""
         # Try main config file first
         if self.claude_config_file.exists():
-            data = self.load_config_file(self.claude_config_file)
+            data, buf = self._load_config_file_raw(self.claude_config_file)
             if data is not None:
-                return data
+                return data, buf
         
         # Try alt config file
         if self.claude_alt_config_file.exists():
-            data = self.load_config_file(self.claude_alt_config_file)
+            data, buf = self._load_config_file_raw(self.claude_alt_config_file)
             if data is not None:
-                return data
+                return data, buf
         
-        return {}
+        return {}, b''
     
     def save_claude_config(self, config_data):
         """Save Claude Code config to the main file with validation"""
         return self.save_config_file(self.claude_config_file, config_data)
     
-    def backup_account(self, account_number, config_data, credentials_data):
-        """Backup account config and credentials"""
+    def backup_account(self, account_number, config_data, credentials_data, validated=False):
+        """Backup account config and credentials
+        
+        Pass validated=True only when both payloads have just been checked
+        with validate_claude_config.
+        """
+        self._ensure_initialized()
+        
         # Validate account number
         if not isinstance(account_number, int) or account_number <= 0:
             print(f"ERROR: Invalid account number {account_number}")
             return False
         
-        # Save config
-        config_file = self.configs_dir / f"{account_number}.json"
-        config_saved = self.save_config_file(config_file, config_data)
+        # Validate everything before writing anything
+        same_payload = credentials_data is config_data
+        if not validated:
+            for payload in (config_data,) if same_payload else (config_data, credentials_data):
+                is_valid, message = self.validate_claude_config(payload)
+                if not is_valid:
+                    print(f"ERROR: Invalid config data - {message}")
+                    return False
         
-        # Save credentials
+        config_file = self.configs_dir / f"{account_number}.json"
         cred_file = self.credentials_dir / f"{account_number}.json"
-        cred_saved = self.save_config_file(cred_file, credentials_data)
         
-        return config_saved and cred_saved
+        try:
+            # Save config
+            config_buf = _json_dumps(config_data)
+            self._write_file_atomic(config_file, config_buf)
+            
+            # Save credentials; identical payloads share the config file's bytes on disk
+            if same_payload:
+                self._link_or_write(config_file, cred_file, config_buf)
+            else:
+                self._write_json_atomic(cred_file, credentials_data)
+        except IOError as e:
+            print(f"ERROR: Could not write backup for account #{account_number}: {e}")
+            return False
+        
+        return True
     
     def list_accounts(self):
         """List all managed accounts"""
+        # Nothing has been written yet, so there is nothing to list
+        if not os.path.exists(self._sequence_file_str):
+            print("No accounts registered yet.")
+            return
+        
         try:
             data = self.load_sequence()
         except (json.JSONDecodeError, ValueError, FileNotFoundError):
@@ -239,24 +582,26 @@ class ClaudeAccountSwitcher:
             print("No accounts registered yet.")
             return
         
-        print(f"{'#':<4} {'Display Name':<20} {'Email':<30} {'UUID':<36} {'Status'}")
-        print("-" * 90)
-        
-        for acc_num in data['sequence']:
-            account_info = data['accounts'].get(str(acc_num), {})
-            display_name = account_info.get('displayName', 'Unknown')
-            email = account_info.get('email', 'Unknown')
-            uuid = account_info.get('uuid', 'Unknown')
-            status = "ACTIVE" if acc_num == active_account_num else ""
-            print(f"{acc_num:<4} {display_name:<20} {email:<30} {uuid:<36} {status}")
+        accounts = data['accounts']
+        rows = [f"{'#':<4} {'Display Name':<20} {'Email':<30} {'UUID':<36} {'Status'}", "-" * 90]
+        rows.extend(
+            f"{acc_num:<4} {info.get('displayName', 'Unknown'):<20} {info.get('email', 'Unknown'):<30} "
+            f"{info.get('uuid', 'Unknown'):<36} {'ACTIVE' if acc_num == active_account_num else ''}"
+            for acc_num in data['sequence']
+            for info in (accounts.get(acc_num, {}),)
+        )
+        
+        # Emit the whole table with a single write instead of one print per row
+        sys.stdout.write('\n'.join(rows) + '\n')
     
     def add_account(self):
         """Add the current Claude Code account to managed accounts"""
         print("Adding current account to managed accounts...")
+        self._ensure_initialized()
         
         try:
             # Get current Claude Code config
-            current_config = self.get_claude_config()
+            current_config, current_buf = self._get_claude_config_raw()
             
             if not current_config:
                 print("ERROR: No Claude Code configuration found. Please log in to Claude Code first.")
@@ -274,33 +619,40 @@ class ClaudeAccountSwitcher:
             uuid = oauth_account.get('accountUuid', 'Unknown')
             display_name = oauth_account.get('displayName', 'Unknown')
             
-            # Get next account number
-            account_number = self.get_next_account_number()
+            # Load current sequence data and claim the next account number
+            data = self.load_sequence()
+            account_number = data['nextAccountNumber']
+            data['nextAccountNumber'] = account_number + 1
+            
+            # One timestamp for both the account entry and the sequence update
+            now = datetime.now().isoformat()
             
             # Prepare account info
             account_info = {
                 'email': email,
                 'uuid': uuid,
                 'displayName': display_name,
-                'added': datetime.now().isoformat()
+                'added': now
             }
             
-            # Load current sequence data
-            data = self.load_sequence()
+            # Backup the account config and credentials (validated above)
+            success = self.backup_account(account_number, current_config, current_config, validated=True)
+            
+            # Only a successful backup may be recorded as matching the live config,
+            # otherwise a later switch would skip backing it up
+            if success:
+                account_info['configHash'] = _config_hash(current_buf)
             
             # Add account to sequence and accounts
             data['sequence'].append(account_number)
-            data['accounts'][str(account_number)] = account_info
+            data['accounts'][account_number] = account_info
             # Set the newly added account as the active account
             data['activeAccountNumber'] = account_number
-            data['lastUpdated'] = datetime.now().isoformat()
+            data['lastUpdated'] = now
             
             # Save the updated sequence
             self.save_sequence(data)
             
-            # Backup the account config and credentials
-            success = self.backup_account(account_number, current_config, current_config)
-            
             if success:
                 print(f"Account '{email}' added successfully as account #{account_number}")
                 return True
@@ -314,6 +666,7 @@ class ClaudeAccountSwitcher:
     
     def switch_to_account(self, target_account):
         """Switch to a specific account by number or email"""
+        self._ensure_initialized()
         try:
             data = self.load_sequence()
         except (json.JSONDecodeError, ValueError, FileNotFoundError):
@@ -321,18 +674,7 @@ class ClaudeAccountSwitcher:
             return False
         
         # Find the account number based on input
-        account_number = None
-        
-        # If target_account is a number
-        if str(target_account).isdigit():
-            if int(target_account) in data['sequence']:
-                account_number = int(target_account)
-        else:
-            # If target_account is an email, find the matching account
-            for acc_num, acc_info in data['accounts'].items():
-                if acc_info.get('emailAddress', '').lower() == str(target_account).lower():
-                    account_number = int(acc_num)
-                    break
+        account_number = self.find_account_number(target_account)
         
         if account_number is None:
             print(f"ERROR: Account '{target_account}' not found.")
@@ -349,20 +691,18 @@ class ClaudeAccountSwitcher:
             if self.is_claude_running():
                 print("WARNING: Claude Code appears to be running.")
                 print("Please close Claude Code before switching accounts to avoid conflicts.")
-                response = input("Continue anyway? (y/N): ")
-                if response.lower() != 'y':
+                if not self.confirm("Continue anyway? (y/N): "):
                     print("Account switch cancelled.")
                     return False
         except Exception:
             # If we can't determine if Claude is running, warn but continue
             print("WARNING: Could not determine if Claude Code is running. Please ensure it's closed before switching.")
-            response = input("Continue anyway? (y/N): ")
-            if response.lower() != 'y':
+            if not self.confirm("Continue anyway? (y/N): "):
                 print("Account switch cancelled.")
                 return False
         
         # Load the target account config
-        target_config = self.load_config_file(config_file)
+        target_config, target_buf = self._load_config_file_raw(config_file)
         if target_config is None:
             print(f"ERROR: Could not load config for account #{account_number}")
             return False
@@ -373,22 +713,37 @@ class ClaudeAccountSwitcher:
             print(f"ERROR: Invalid config for account #{account_number} - {message}")
             return False
         
-        # Save the current config as backup (in case something goes wrong)
+        # Save the current config as backup (in case something goes wrong),
+        # unless it is byte-for-byte what was last backed up or applied
         try:
-            current_config = self.get_claude_config()
+            current_config, current_buf = self._get_claude_config_raw()
             if current_config:
                 current_account_num = data.get('activeAccountNumber', 0)
                 if current_account_num > 0:
-                    self.backup_account(current_account_num, current_config, current_config)
+                    current_info = data['accounts'].get(current_account_num, {})
+                    current_hash = _config_hash(current_buf)
+                    backup_present = (
+                        (self.configs_dir / f"{current_account_num}.json").exists()
+                        and (self.credentials_dir / f"{current_account_num}.json").exists()
+                    )
+                    if current_info.get('configHash') != current_hash or not backup_present:
+                        if self.backup_account(current_account_num, current_config, current_config):
+                            current_info['configHash'] = current_hash
         except Exception as e:
             print(f"WARNING: Could not backup current config: {e}")
         
-        # Apply the new configuration
-        if not self.save_claude_config(target_config):
-            print("ERROR: Failed to save new Claude Code configuration.")
+        # Apply the new configuration. The backup bytes were just validated,
+        # so write them out as-is instead of re-serializing the parsed config
+        try:
+            self._write_file_atomic(self.claude_config_file, target_buf)
+        except IOError as e:
+            print(f"ERROR: Failed to save new Claude Code configuration: {e}")
             return False
         
         # Update active account in sequence file
+        target_info = data['accounts'].get(account_number)
+        if target_info is not None:
+            target_info['configHash'] = _config_hash(target_buf)
         data['activeAccountNumber'] = account_number
         data['lastUpdated'] = datetime.now().isoformat()
         try:
@@ -398,12 +753,13 @@ class ClaudeAccountSwitcher:
             return False
         
         # Get account email for confirmation message
-        target_email = data['accounts'].get(str(account_number), {}).get('email', 'Unknown')
+        target_email = data['accounts'].get(account_number, {}).get('email', 'Unknown')
         print(f"Switched to account #{account_number}: {target_email}")
         return True
     
     def switch_to_next_account(self):
         """Switch to the next account in sequence"""
+        self._ensure_initialized()
         data = self.load_sequence()
         current_active = data.get('activeAccountNumber', 0)
         
@@ -423,7 +779,34 @@ class ClaudeAccountSwitcher:
         return self.switch_to_account(next_account)
     
     def is_claude_running(self):
-        """Check if Claude Code is currently running"""
+        """Check if Claude Code is currently running
+        
+        The result is cached on disk for RUNNING_CHECK_TTL seconds, so
+        back-to-back invocations (e.g. a scripted loop of switches) only
+        scan the process list once.
+        """
+        try:
+            with open(self.running_cache_file, 'rb') as f:
+                running, checked_at = struct.unpack(RUNNING_CACHE_FORMAT, f.read())
+            if 0 <= time.time() - checked_at < RUNNING_CHECK_TTL:
+                return running
+        except (OSError, struct.error):
+            pass  # No usable cached result
+        
+        running = self._check_claude_running()
+        try:
+            self._write_file_atomic(self.running_cache_file, struct.pack(RUNNING_CACHE_FORMAT, running, time.time()))
+        except OSError:
+            pass  # The cache is only an optimization
+        return running
+    
+    def _check_claude_running(self):
+        """Scan the running processes for Claude Code, bypassing the cache"""
+        try:
+            return _claude_running_toolhelp()
+        except Exception:
+            pass  # Process snapshot API unavailable, fall back to tasklist
+        
         try:
             # Use tasklist command to check for Claude Code processes
             result = subprocess.run(
@@ -439,6 +822,7 @@ class ClaudeAccountSwitcher:
     
     def remove_account(self, target_account):
         """Remove an account by number or email"""
+        self._ensure_initialized()
         try:
             data = self.load_sequence()
         except (json.JSONDecodeError, ValueError, FileNotFoundError):
@@ -446,28 +830,16 @@ class ClaudeAccountSwitcher:
             return False
         
         # Find the account number based on input
-        account_number = None
-        
-        # If target_account is a number
-        if str(target_account).isdigit():
-            if int(target_account) in data['sequence']:
-                account_number = int(target_account)
-        else:
-            # If target_account is an email, find the matching account
-            for acc_num, acc_info in data['accounts'].items():
-                if acc_info.get('emailAddress', '').lower() == str(target_account).lower():
-                    account_number = int(acc_num)
-                    break
+        account_number = self.find_account_number(target_account)
         
         if account_number is None:
             print(f"ERROR: Account '{target_account}' not found.")
             return False
         
         # Confirm deletion
-        account_email = data['accounts'].get(str(account_number), {}).get('emailAddress', 'Unknown')
+        account_email = data['accounts'].get(account_number, {}).get('email', 'Unknown')
         print(f"Removing account #{account_number}: {account_email}")
-        response = input("Are you sure you want to remove this account? (y/N): ")
-        if response.lower() != 'y':
+        if not self.confirm("Are you sure you want to remove this account? (y/N): "):
             print("Account removal cancelled.")
             return False
         
@@ -476,8 +848,8 @@ class ClaudeAccountSwitcher:
             data['sequence'].remove(account_number)
         
         # Remove from accounts
-        if str(account_number) in data['accounts']:
-            del data['accounts'][str(account_number)]
+        if account_number in data['accounts']:
+            del data['accounts'][account_number]
         
         # If this was the active account, reset active account number
         if data.get('activeAccountNumber') == account_number:
@@ -527,6 +899,7 @@ Examples:
   %(prog)s --switch-to 2            Switch to account #2
   %(prog)s --switch-to user@example.com  Switch to account by email
   %(prog)s --remove-account 2       Remove account #2
+  %(prog)s --remove-account 2 --yes Remove account #2 without confirmation
         """
     )
     
@@ -561,10 +934,16 @@ Examples:
         help='Remove account by number or email'
     )
     
+    parser.add_argument(
+        '--yes', '-y',
+        action='store_true',
+        help='Answer yes to all confirmation prompts (for scripting)'
+    )
+    
     args = parser.parse_args()
     
     # Create switcher instance
-    switcher = ClaudeAccountSwitcher()
+    switcher = ClaudeAccountSwitcher(assume_yes=args.yes)
     
     # Handle commands
     if args.list: